@@ -1,15 +1,22 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
+import re
 import time
-import requests
+import html
+import threading
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
+from ticker_view import TickerView
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="Catalyst & Flow Tracker", layout="wide")
 
 # --- CUSTOM CSS FOR STYLING ---
-st.markdown("""
+# Kept as one constant literal. It is still emitted on every run: Streamlit removes
+# any element a rerun doesn't re-send, so skipping it would drop the styles.
+_CSS = """
 <style>
     /* Modern, elegant, minimalist styling */
     .metric-card {
@@ -40,30 +47,106 @@ st.markdown("""
     .pos-return { color: #5C946E !important; }
     .neg-return { color: #C96464 !important; }
     h1, h2, h3 { font-weight: 400 !important; letter-spacing: -0.5px; }
+    .data-table { width: 100%; border-collapse: collapse; font-size: 14px; }
+    .data-table th {
+        font-size: 11px;
+        text-transform: uppercase;
+        letter-spacing: 1.5px;
+        color: #888888;
+        font-weight: 600;
+        text-align: left;
+        padding: 8px 12px;
+        border-bottom: 1px solid rgba(128, 128, 128, 0.4);
+    }
+    .data-table td { padding: 8px 12px; border-bottom: 1px solid rgba(128, 128, 128, 0.2); }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # --- CACHED DATA FETCHING ---
-# The @st.cache_data decorator saves the result for 1 hour (3600 seconds).
-# This prevents Yahoo from blocking the app due to too many requests!
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_stock_data(ticker):
-    stock = yf.Ticker(ticker)
+# yfinance, yfinance_cache and pandas are imported inside the functions that use
+# them, so the page renders without paying their import cost until a ticker is entered.
+# A fresh Ticker for every call: Ticker objects memoize holders/fast_info on the
+# instance and aren't thread-safe, so sharing one (across reruns, or across the
+# concurrent calls in load_stock_data) could serve stale or half-filled data.
+# (yfinance keeps Yahoo's cookie/crumb in its own shared session either way.)
+# yfinance_cache's constructor already talks to Yahoo (exchange/timezone lookup), so
+# it can fail in exactly the rate-limited case we need to survive. Fall back to a
+# plain yfinance Ticker, whose constructor is offline; the raw chart fallback below
+# still covers the case where that one can't fetch either.
+def open_ticker(ticker):
+    try:
+        import yfinance_cache as yfc
+        return yfc.Ticker(ticker)
+    except Exception:
+        import yfinance as yf
+        return yf.Ticker(ticker)
+
+# Session for the raw Yahoo fallback, shared by every user of this process: its
+# connection pool keeps TLS connections to Yahoo alive between lookups, repeat GETs
+# are answered from an on-disk cache for an hour (shared by replicas on the same
+# volume, unlike @st.cache_data), and 429/5xx answers are retried with
+# exponential backoff at the adapter level. Retry-After is ignored so a rate-limit
+# reply can't park the script for minutes.
+# (yfinance itself needs its own curl_cffi session, so this isn't handed to yf.Ticker.)
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    session = requests_cache.CachedSession('yf_cache', expire_after=3600)
+    session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], respect_retry_after_header=False)
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry))
+    return session
+
+PROFILE_FIELDS = ('shortName', 'sector', 'industry', 'marketCap')
+FETCH_TIMEOUT = 10 # seconds, shared by all concurrent Yahoo calls for one ticker
+
+# One pool for every Yahoo call in the process. A call that outlives FETCH_TIMEOUT
+# keeps its worker until yfinance gives up on it, so this caps how many threads
+# stalled requests can ever tie up.
+@st.cache_resource(show_spinner=False)
+def get_fetch_pool():
+    return ThreadPoolExecutor(max_workers=8)
+
+# Raised by fetch_stock_data when any Yahoo call failed or timed out, so the degraded
+# result stays out of the hour-long cache. The caller still gets the partial data
+# through .result.
+class IncompleteFetch(Exception):
+    def __init__(self, result):
+        super().__init__("Yahoo data incomplete")
+        self.result = result
+
+def load_stock_data(ticker, pool=None):
+    import pandas as pd
     hist_max = pd.DataFrame()
+    complete = True
+    
+    # 1. Fire all four Yahoo requests at once. They are pure network waits,
+    # so overlapping them cuts the load time down to the slowest single call.
+    # Each call builds its own Ticker inside its worker (see open_ticker), so the
+    # constructor's own Yahoo lookup also counts against the shared deadline.
+    pool = pool or get_fetch_pool()
+    f_hist = pool.submit(lambda: open_ticker(ticker).history(period="max"))
+    f_info = pool.submit(lambda: open_ticker(ticker).info)
+    f_mcap = pool.submit(lambda: open_ticker(ticker).fast_info.get('marketCap', 0))
+    f_funds = pool.submit(lambda: open_ticker(ticker).mutualfund_holders)
+    # Every wait below shares one deadline and times out into its except branch.
+    deadline = time.monotonic() + FETCH_TIMEOUT
+    
+    def time_left():
+        return max(0, deadline - time.monotonic())
     
-    # 1. Fetch History (Our primary source of truth)
+    # 2. Collect History (Our primary source of truth)
     # We wrap this in a try-except because Streamlit Cloud frequently gets YFRateLimitErrors
     try:
-        hist_max = stock.history(period="max")
+        hist_max = f_hist.result(timeout=time_left())
     except Exception:
-        pass # Ignore the crash, we will use the raw fallback below
+        complete = False # Ignore the crash, we will use the raw fallback below
         
-    # 2. RAW HTTP FALLBACK: If yfinance is blocked, we fetch directly from Yahoo's backend
+    # 3. RAW HTTP FALLBACK: If yfinance is blocked, we fetch directly from Yahoo's backend
     if hist_max is None or hist_max.empty:
         try:
             url = f"https://query2.finance.yahoo.com/v8/finance/chart/{ticker}?range=max&interval=1d"
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'}
-            res = requests.get(url, headers=headers, timeout=5)
+            res = get_http_session().get(url, timeout=5)
             
             if res.status_code == 200:
                 data = res.json()
@@ -76,66 +159,255 @@ def fetch_stock_data(ticker):
 
     # If even the fallback fails, return a polite error instead of a crashed app
     if hist_max is None or hist_max.empty:
-        return False, f"Data completely blocked by Yahoo for {ticker}. Please try again later.", None, None, None, None
+        for f in (f_info, f_mcap, f_funds):
+            f.cancel()
+        return False, (False, f"Data completely blocked by Yahoo for {ticker}. Please try again later.", None, None, None, None, None)
         
+    # Only Close is used downstream, so don't cache (and re-pickle) the other OHLCV columns
+    hist_max = hist_max[['Close']].copy()
     ipo_date = hist_max.index.min().date()
     
-    # 3. Fetch Info (Silently catch rate limits)
+    # 4. Collect Info (Silently catch rate limits)
+    # Only keep the handful of fields the page shows, not the whole ~50KB blob
     try:
-        stock_info = stock.info or {}
+        info = f_info.result(timeout=time_left()) or {}
+        stock_info = {k: info[k] for k in PROFILE_FIELDS if k in info}
     except Exception:
         stock_info = {}
+        complete = False
         
-    # 4. Fetch Fast Info for backup Market Cap
+    # 5. Collect Fast Info for backup Market Cap
     try:
-        fast_mcap = stock.fast_info.get('marketCap', 0)
+        fast_mcap = f_mcap.result(timeout=time_left())
     except Exception:
         fast_mcap = 0
+        complete = False
         
-    return True, "Success", hist_max, stock_info, ipo_date, fast_mcap
+    # 6. Collect Fund Holders (only shown for mature companies, but it rides along in the same burst)
+    try:
+        funds = f_funds.result(timeout=time_left())
+    except Exception:
+        funds = None
+        complete = False
+        
+    return complete, (True, "Success", hist_max, stock_info, ipo_date, fast_mcap, funds)
+
+# Every fetch, complete or degraded, is kept for a minute. While Yahoo is rate-limiting
+# us, reruns (every widget interaction) reuse the degraded result instead of asking again.
+# (_pool is left out of the cache key by Streamlit; see the warm-up below.)
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_recent_stock_data(ticker, _pool=None):
+    return load_stock_data(ticker, _pool)
+
+# The @st.cache_data decorator saves the result for 1 hour (3600 seconds).
+# This prevents Yahoo from blocking the app due to too many requests!
+# Only complete results make it in; a degraded one is raised past this cache and is
+# retried once the one-minute entry above expires.
+# Underneath it, yfinance_cache keeps history/info/holders on disk, so restarts and
+# redeploys don't start from a cold cache either.
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_stock_data(ticker, _pool=None):
+    complete, result = fetch_recent_stock_data(ticker, _pool)
+    if not complete:
+        raise IncompleteFetch(result)
+    return result
+
+# --- CACHE WARM-UP ---
+# Popular tickers get fetched in the background as soon as the server starts, so
+# the first user to look one up is served from cache. @st.cache_resource makes
+# this run once per process rather than once per session. Tickers are warmed one
+# at a time on the warm-up's own small pool, so cold max-history downloads never
+# queue ahead of a real user's requests in get_fetch_pool(), and Yahoo only sees
+# four requests at a time from it.
+_WATCHLIST = ('AAPL', 'MSFT', 'NVDA', 'ARM', 'TSLA', 'GOOG')
 
-@st.cache_data(ttl=86400, show_spinner=False) # Cache funds for 24 hours
-def fetch_funds(ticker):
+def warm_one(ticker, pool):
+    # A failure only costs that ticker its warm entry; the rest still get fetched
     try:
-        return yf.Ticker(ticker).mutualfund_holders
+        fetch_stock_data(ticker, _pool=pool)
     except Exception:
-        return None
+        pass
+
+@st.cache_resource(show_spinner=False)
+def warm_watchlist():
+    def warm():
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for ticker in _WATCHLIST:
+                warm_one(ticker, pool)
+    
+    threading.Thread(target=warm, daemon=True).start()
+    return True
 
 # --- METRICS CALCULATOR ---
-def calculate_metrics(hist_max):
-    current_year = datetime.now().year
+# Every window (YTD, 1-Year) is sliced out of the cached max-period history,
+# so a page load never needs a second history() request to Yahoo.
+def calculate_metrics(hist_max, today):
+    import pandas as pd
+    current_year = today.year
     if hist_max is None or hist_max.empty:
         return 0, 0, "N/A", "N/A"
         
-    current_price = float(hist_max['Close'].iloc[-1])
-    prev_close = float(hist_max['Close'].iloc[-2]) if len(hist_max) > 1 else current_price
+    # Pull the backing array once; every price below is a plain ndarray subscript
+    closes = hist_max['Close'].to_numpy()
+    current_price = float(closes[-1])
+    prev_close = float(closes[-2]) if len(closes) > 1 else current_price
     
-    # YTD
-    ytd_data = hist_max[hist_max.index.year == current_year]
-    if not ytd_data.empty:
-        first_ytd = float(ytd_data['Close'].iloc[0])
+    # YTD: the index is sorted by date, so a binary search for Jan 1 in the index's
+    # own timezone finds the first session of the year without building a mask.
+    ytd_start = hist_max.index.searchsorted(pd.Timestamp(current_year, 1, 1, tz=hist_max.index.tz))
+    if ytd_start < len(closes):
+        first_ytd = float(closes[ytd_start])
         ytd_val = ((current_price - first_ytd) / first_ytd) * 100
         ytd_return = f"{ytd_val:+.2f}%"
     else:
         ytd_return = "N/A"
         
-    # 1-Year (Handles timezone differences safely)
-    now_ts = pd.Timestamp.now(tz=hist_max.index.tz) if hasattr(hist_max.index, 'tz') else pd.Timestamp.now()
-    one_year_ago = now_ts - pd.Timedelta(days=365)
-    past_data = hist_max[hist_max.index <= one_year_ago]
+    # 1-Year: the last close dated on or before the same day a year ago, found by
+    # binary search in the index's own timezone. Calendar-based, so it stays right for
+    # 24/7 markets (BTC-USD), other holiday calendars and tickers that stopped trading.
+    one_year_ago = today - timedelta(days=365)
+    idx = hist_max.index
+    cutoff = pd.Timestamp(one_year_ago.year, one_year_ago.month, one_year_ago.day, tz=idx.tz) + pd.Timedelta(days=1)
+    one_y_pos = idx.searchsorted(cutoff, side='left') - 1
     
-    if not past_data.empty:
-        first_1y = float(past_data['Close'].iloc[-1])
+    if one_y_pos >= 0:
+        first_1y = float(closes[one_y_pos])
         one_yr_val = ((current_price - first_1y) / first_1y) * 100
-        one_yr_return = f"{one_yr_val:+.2f}%" if len(hist_max) >= 250 else f"{one_yr_val:+.2f}% (Since IPO)"
+        one_yr_return = f"{one_yr_val:+.2f}%" if len(closes) >= 250 else f"{one_yr_val:+.2f}% (Since IPO)"
     else:
-        first_ipo = float(hist_max['Close'].iloc[0])
+        first_ipo = float(closes[0])
         one_yr_val = ((current_price - first_ipo) / first_ipo) * 100
         one_yr_return = f"{one_yr_val:+.2f}% (Since IPO)"
 
     return current_price, prev_close, ytd_return, one_yr_return
 
+# --- MECHANICAL DEADLINES ---
+_DEADLINE_OFFSETS = (
+    ("IPO Pricing / First Trade", timedelta(0)),
+    ("Quiet Period (T+25)", timedelta(days=25)),
+    ("Lock-Up Expiry (T+180)", timedelta(days=180)),
+)
+
+def get_mechanical_deadlines(ipo_date):
+    return tuple((event, ipo_date + offset) for event, offset in _DEADLINE_OFFSETS) if ipo_date else ()
+
+# --- TICKER VIEW ---
+# Caching the finished TickerView (rather than the raw data) means a rerun from an
+# unrelated widget, like the sector override, just reads it back instead of recomputing.
+def build_ticker_view(data, today):
+    success, msg, hist_max, stock_info, ipo_date, fast_mcap, funds = data
+    if not success:
+        return False, msg, None
+    
+    cp, pc, ytd, oyr = calculate_metrics(hist_max, today)
+    
+    deadlines = get_mechanical_deadlines(ipo_date)
+    
+    top_funds = ()
+    if funds is not None and not funds.empty:
+        import numpy as np
+        # Straight from the backing arrays to table rows, no intermediate DataFrame
+        names = funds['Holder'].to_numpy()[:5]
+        pcts = np.char.mod('%.2f%%', funds['pctHeld'].to_numpy()[:5] * 100)
+        top_funds = tuple(zip(names.tolist(), pcts.tolist()))
+    
+    view = TickerView(
+        ipo_date=ipo_date,
+        short_name=stock_info.get('shortName', 'Company Name'),
+        sector=stock_info.get('sector', 'Unknown'),
+        industry=stock_info.get('industry', 'Unknown'),
+        mcap=stock_info.get('marketCap', fast_mcap),
+        current_price=cp,
+        prev_close=pc,
+        ytd_return=ytd,
+        one_yr_return=oyr,
+        deadlines=deadlines,
+        top_funds=top_funds,
+    )
+    return True, "Success", view
+
+# An IncompleteFetch from fetch_stock_data passes straight through, so a degraded
+# view never lands in this cache either. The TTL is kept short because it stacks on
+# top of fetch_stock_data's hour: a view built from a nearly expired fetch would
+# otherwise live on for another hour, so data is at most ~65 minutes old.
+@st.cache_data(ttl=300, show_spinner=False)
+def compute_ticker_view(ticker, today):
+    return build_ticker_view(fetch_stock_data(ticker), today)
+
+# --- SECTOR CLASSIFICATION ---
+# Auto-detect checks are a set lookup for sectors (lowercase, matched against the
+# lowercased sector) and one precompiled scan for industries
+_TECH_SECTORS = frozenset({'technology', 'communication services', 'consumer discretionary'})
+_BIOTECH_SECTORS = frozenset({'healthcare'})
+_BIOTECH_RE = re.compile(r'biotech|pharmaceutical', re.IGNORECASE)
+
+# --- INDEX INCLUSION TARGETS ---
+# Every row the table can show, built once. build_inclusions only picks rows by key.
+# The S&P row's target depends on the IPO date and is filled in per call.
+_ALL_INCLUSIONS = (
+    ("russell_june", {"Index": "Russell 2000/3000", "Target": "Late June", "Prob": "High", "Rationale": "Eligible for the June Reconstitution."}),
+    ("russell_dec", {"Index": "Russell 2000/3000", "Target": "Dec 11", "Prob": "High", "Rationale": "Eligible for the December Semi-Annual Reconstitution."}),
+    ("crsp", {"Index": "CRSP US Total Market (VTI)", "Target": "Next Quarterly Rebalance", "Prob": "High", "Rationale": "Quarterly rebalance inclusion."}),
+    ("msci_high", {"Index": "MSCI USA IMI", "Target": "Next Index Review", "Prob": "High", "Rationale": "Quarterly/Semi-Annual reviews based on liquidity/cap."}),
+    ("msci_medium", {"Index": "MSCI USA IMI", "Target": "Next Index Review", "Prob": "Medium", "Rationale": "Quarterly/Semi-Annual reviews based on liquidity/cap."}),
+    ("sp1500", {"Index": "S&P Composite 1500", "Target": "After {seasoned}", "Prob": "Low", "Rationale": "Requires 12 months seasoning + GAAP profitability."}),
+    ("biotech", {"Index": "S&P Biotech (XBI)", "Target": "Next Quarterly Rebalance", "Prob": "High", "Rationale": "Requires 1-2 months seasoning."}),
+    ("biotech", {"Index": "Nasdaq Biotech (NBI)", "Target": "December (Annual)", "Prob": "High", "Rationale": "Annual December reconstitution."}),
+    ("tech", {"Index": "Nasdaq 100 (QQQ)", "Target": "Standard or Fast Entry (15 Days)", "Prob": "Varies", "Rationale": "Standard requires 3mo seasoning. Mega-caps fast-track in 15 days."}),
+)
+
+# The table only depends on a few discrete inputs, so it is built once per
+# combination and served from cache on every rerun after that.
+@st.cache_data(show_spinner=False)
+def build_inclusions(ipo_date, mcap_bucket, is_biotech, is_tech):
+    ipo_month = ipo_date.month
+    flags = {
+        "russell_june": ipo_month <= 4,
+        "russell_dec": 4 < ipo_month <= 10,
+        "crsp": True,
+        "msci_high": mcap_bucket == 'high',
+        "msci_medium": mcap_bucket != 'high',
+        "sp1500": True,
+        "biotech": is_biotech,
+        "tech": is_tech and not is_biotech,
+    }
+    seasoned = (ipo_date + timedelta(days=365)).strftime('%b %Y')
+    
+    return [
+        dict(row, Target=row["Target"].format(seasoned=seasoned)) if key == "sp1500" else row
+        for key, row in _ALL_INCLUSIONS if flags[key]
+    ]
+
+# --- HTML RENDERING ---
+# The tables on this page are only a handful of rows, so we render them as plain
+# HTML instead of paying for a DataFrame + Arrow round-trip through st.table.
+def html_table(headers, rows):
+    head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>"
+        for row in rows
+    )
+    return f'<table class="data-table"><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>'
+
+_CARD_TPL = (
+    '<div class="metric-card">'
+    '<div class="metric-label">{event}</div>'
+    '<div class="metric-value">{date}</div>'
+    '<div style="color: {color}; font-size: 11px; font-weight: 600; letter-spacing: 1px; text-transform: uppercase; margin-top: 12px;">{status}</div>'
+    '</div>'
+)
+
+def deadline_card(event, date, today):
+    color, status = ('#888888', 'Passed') if date < today else ('#5C946E', 'Upcoming')
+    return _CARD_TPL.format_map({'event': event, 'date': date.strftime('%b %d, %Y'), 'color': color, 'status': status})
+
 # --- UI LAYOUT ---
+# Yahoo symbols: letters/digits with '.', '-' or '=' (0700.HK, RELIANCE.NS, BRK-B, GC=F)
+# and an optional leading '^' for indices (^GSPC)
+_TICKER_RE = re.compile(r'^\^?[A-Z0-9][A-Z0-9.\-=]{0,19}$')
+
+warm_watchlist()
+
 st.title("Post-IPO Catalyst & Flow Tracker")
 st.markdown("<p style='color: #888; font-size: 16px; font-weight: 300;'>Predictive Index Inclusion & IPO Lock-up Mapping</p>", unsafe_allow_html=True)
 st.write("")
@@ -152,26 +424,40 @@ with col_override:
 
 if ticker_input:
     ticker = ticker_input.upper().strip()
+    # One clock read per rerun, so every date comparison below agrees (even across midnight)
+    today = datetime.now().date()
+    
+    # Reject obvious typos before they cost a Yahoo round trip (and a cached miss)
+    if not _TICKER_RE.match(ticker):
+        st.error(f"'{ticker}' is not a valid ticker format. Tickers are up to 20 letters or digits, optionally joined by '.', '-' or '=' and led by '^' for indices (e.g. BRK-B, 0700.HK, ^GSPC).")
+        st.stop()
+        
     with st.spinner(f"Pulling optimized market data for {ticker}..."):
         
-        # Call our new, super-fast cached functions!
-        success, msg, hist_max, stock_info, ipo_date, fast_mcap = fetch_stock_data(ticker)
+        # One cached call returns the whole precomputed page for this ticker.
+        # If Yahoo only partly answered, render what we got (held for a minute, not the hour).
+        try:
+            success, msg, view = compute_ticker_view(ticker, today)
+        except IncompleteFetch as e:
+            success, msg, view = build_ticker_view(e.result, today)
         
         if not success:
             st.error(msg)
         else:
+            ipo_date = view.ipo_date
+            
             # Profile Data
-            sector = stock_info.get('sector', 'Unknown')
-            industry = stock_info.get('industry', 'Unknown')
+            sector = view.sector
+            industry = view.industry
             
             display_sector = sector
             if sector == 'Unknown' and sector_override != "Auto-Detect":
                 display_sector = f"Manual: {sector_override}"
             
-            mcap = stock_info.get('marketCap', fast_mcap)
+            mcap = view.mcap
             mcap_str = f"${mcap / 1e9:.2f}B" if mcap else "Unknown"
             
-            days_public = (datetime.now().date() - ipo_date).days
+            days_public = (today - ipo_date).days
             is_mature = days_public > 365
             status_badge = "Mature Company" if is_mature else "Recent IPO"
 
@@ -180,22 +466,27 @@ if ticker_input:
             # Top Row: Info & Prices
             col1, col2 = st.columns([1, 2])
             with col1:
-                st.subheader(f"{ticker} Profile")
-                st.caption(stock_info.get('shortName', 'Company Name'))
-                st.markdown(f"**Status:** {status_badge}")
-                st.markdown(f"**Sector:** {display_sector}")
-                st.markdown(f"**Industry:** {industry}")
-                st.markdown(f"**Est. Market Cap:** {mcap_str}")
+                # One element for the whole panel (two trailing spaces = markdown line break).
+                # HTML is allowed here, so every Yahoo-supplied value is escaped.
+                st.markdown(
+                    f"### {ticker} Profile\n"
+                    f"<p style='color: #888; font-size: 14px;'>{html.escape(str(view.short_name))}</p>\n\n"
+                    f"**Status:** {status_badge}  \n"
+                    f"**Sector:** {html.escape(str(display_sector))}  \n"
+                    f"**Industry:** {html.escape(str(industry))}  \n"
+                    f"**Est. Market Cap:** {mcap_str}",
+                    unsafe_allow_html=True,
+                )
                 
             with col2:
                 st.subheader("Price & Performance")
-                cp, pc, ytd, oyr = calculate_metrics(hist_max)
+                cp, pc = view.current_price, view.prev_close
                 
                 m1, m2, m3, m4 = st.columns(4)
                 m1.metric("Current Price", f"${cp:.2f}" if cp else "N/A", f"{cp - pc:+.2f}" if cp and pc else None)
                 m2.metric("Previous Close", f"${pc:.2f}" if pc else "N/A")
-                m3.metric("YTD Return", ytd)
-                m4.metric("1-Year Return", oyr)
+                m3.metric("YTD Return", view.ytd_return)
+                m4.metric("1-Year Return", view.one_yr_return)
 
             st.write("---")
 
@@ -203,26 +494,9 @@ if ticker_input:
             st.subheader("Mechanical & Regulatory Deadlines")
             st.write("")
             
-            deadlines = {
-                "IPO Pricing / First Trade": ipo_date,
-                "Quiet Period (T+25)": ipo_date + timedelta(days=25),
-                "Lock-Up Expiry (T+180)": ipo_date + timedelta(days=180)
-            }
-            
-            d_cols = st.columns(3)
-            for idx, (event, date) in enumerate(deadlines.items()):
-                passed = date < datetime.now().date()
-                status = "Passed" if passed else "Upcoming"
-                color = "#888888" if passed else "#5C946E"
-                
-                with d_cols[idx]:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">{event}</div>
-                        <div class="metric-value">{date.strftime('%b %d, %Y')}</div>
-                        <div style="color: {color}; font-size: 11px; font-weight: 600; letter-spacing: 1px; text-transform: uppercase; margin-top: 12px;">{status}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+            # All three cards go out in one markdown call (one element instead of three)
+            cards_html = "".join([deadline_card(event, date, today) for event, date in view.deadlines])
+            st.markdown(f"<div style='display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 16px;'>{cards_html}</div>", unsafe_allow_html=True)
 
             st.write("---")
 
@@ -231,32 +505,14 @@ if ticker_input:
                 st.subheader("Top Passive Institutional Holders")
                 st.markdown(f"<p style='color: #888; font-size: 14px;'>{ticker} has been public for >1 year. Mechanical lock-ups are irrelevant. The funds listed below control the daily passive flows.</p>", unsafe_allow_html=True)
                 
-                # Fetch cached funds
-                funds = fetch_funds(ticker)
-                
-                if funds is not None and not funds.empty:
-                    funds_clean = funds.head(5)[['Holder', 'pctHeld']]
-                    funds_clean['pctHeld'] = (funds_clean['pctHeld'] * 100).round(2).astype(str) + '%'
-                    funds_clean.columns = ['Fund Name', '% of Float Owned']
-                    st.table(funds_clean)
+                if view.top_funds:
+                    st.markdown(html_table(['Fund Name', '% of Float Owned'], view.top_funds), unsafe_allow_html=True)
                 else:
                     st.warning("Fund data temporarily unavailable due to rate limits from data provider.")
             else:
                 st.subheader("Predictive Index Inclusion Targets")
                 st.write("")
                 
-                inclusions = []
-                ipo_month = ipo_date.month
-                
-                if ipo_month <= 4: 
-                    inclusions.append({"Index": "Russell 2000/3000", "Target": "Late June", "Prob": "High", "Rationale": "Eligible for the June Reconstitution."})
-                elif ipo_month <= 10: 
-                    inclusions.append({"Index": "Russell 2000/3000", "Target": "Dec 11", "Prob": "High", "Rationale": "Eligible for the December Semi-Annual Reconstitution."})
-                
-                inclusions.append({"Index": "CRSP US Total Market (VTI)", "Target": "Next Quarterly Rebalance", "Prob": "High", "Rationale": "Quarterly rebalance inclusion."})
-                inclusions.append({"Index": "MSCI USA IMI", "Target": "Next Index Review", "Prob": "High" if mcap >= 1e9 else "Medium", "Rationale": "Quarterly/Semi-Annual reviews based on liquidity/cap."})
-                inclusions.append({"Index": "S&P Composite 1500", "Target": f"After {(ipo_date + timedelta(days=365)).strftime('%b %Y')}", "Prob": "Low", "Rationale": "Requires 12 months seasoning + GAAP profitability."})
-                
                 is_biotech = False
                 is_tech = False
                 
@@ -265,13 +521,14 @@ if ticker_input:
                 elif sector_override == "Technology / Growth":
                     is_tech = True
                 elif sector_override == "Auto-Detect":
-                    is_biotech = sector == 'Healthcare' or 'Biotech' in industry or 'Pharmaceutical' in industry
-                    is_tech = sector in ['Technology', 'Communication Services', 'Consumer Discretionary']
+                    # Yahoo can send sector/industry as None rather than leaving them out
+                    sector_l = (sector or '').lower()
+                    is_biotech = sector_l in _BIOTECH_SECTORS or bool(_BIOTECH_RE.search(industry or ''))
+                    is_tech = sector_l in _TECH_SECTORS
 
-                if is_biotech:
-                    inclusions.append({"Index": "S&P Biotech (XBI)", "Target": "Next Quarterly Rebalance", "Prob": "High", "Rationale": "Requires 1-2 months seasoning."})
-                    inclusions.append({"Index": "Nasdaq Biotech (NBI)", "Target": "December (Annual)", "Prob": "High", "Rationale": "Annual December reconstitution."})
-                elif is_tech or (not is_biotech and sector_override == "Auto-Detect"):
-                    inclusions.append({"Index": "Nasdaq 100 (QQQ)", "Target": "Standard or Fast Entry (15 Days)", "Prob": "Varies", "Rationale": "Standard requires 3mo seasoning. Mega-caps fast-track in 15 days."})
+                mcap_bucket = 'high' if mcap and mcap >= 1e9 else 'low'
+                # Auto-Detect still shows the Nasdaq 100 row for anything that isn't biotech
+                show_tech = is_tech or (not is_biotech and sector_override == "Auto-Detect")
+                inclusions = build_inclusions(ipo_date, mcap_bucket, is_biotech, show_tech)
 
-                st.table(pd.DataFrame(inclusions))
+                st.markdown(html_table(inclusions[0].keys(), (row.values() for row in inclusions)), unsafe_allow_html=True)
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from datetime import date
+
+# Everything the page shows for a ticker, boiled down to plain values.
+# It lives outside app.py on purpose: st.cache_data pickles it, and Streamlit swaps
+# the script's __main__ module on every rerun, so a class defined in the script can
+# stop matching its pickled reference while another session reruns.
+@dataclass(frozen=True, slots=True)
+class TickerView:
+    ipo_date: date
+    short_name: str
+    sector: str
+    industry: str
+    mcap: float
+    current_price: float
+    prev_close: float
+    ytd_return: str
+    one_yr_return: str
+    deadlines: tuple # ((event, date), ...)
+    top_funds: tuple # ((fund name, % of float), ...), empty if unavailable